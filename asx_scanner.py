@@ -1,24 +1,151 @@
 # asx_scanner.py - GitHub Actions optimized version
 import requests
 import pandas as pd
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import smtplib
-from email.mime.text import MimeText
-from email.mime.multipart import MimeMultipart
+import atexit
+from email.message import EmailMessage
 from datetime import datetime, timedelta
 import time
 import re
 import logging
 import os
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+from dataclasses import dataclass, field
+from collections import defaultdict, Counter
 import json
 
+try:
+    import brotli  # Enables urllib3 to decode 'br' responses
+    ACCEPT_ENCODING = 'br, gzip, deflate'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Patterns used while parsing scraped rows and formatting summaries
+_CODE_RE = re.compile(r'\b([A-Z]{2,4})\b')
+_PARENS_CODE_RE = re.compile(r'\([A-Z]{2,4}\)')
+_PROJECT_RE = re.compile(r'\b(at|from|in)\s+([A-Z][a-zA-Z\s]+?)(?:\s|$|,|\()')
+_LOCATION_RE = re.compile(r'\b([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)\s+(?:Project|Mine|Deposit|Operation)')
+_NUMBERS_RE = re.compile(r'(\d+(?:\.\d+)?(?:Mlb|klb|Mt|kt|oz|%|million|billion))')
+
+# ETags of previously scraped pages, used for conditional GETs across runs
+REPORTS_DIR = "reports"
+ETAG_CACHE_FILE = os.path.join(REPORTS_DIR, ".etag.json")
+
+# Only build the tree for tables (and everything inside them) when scraping
+_TABLE_STRAINER = SoupStrainer('table')
+
+# Sentiment keywords, matched against lower-cased announcement titles
+POSITIVE_KEYWORDS = (
+    'increase', 'growth', 'strong', 'successful', 'positive', 'upgrade', 
+    'expansion', 'discovery', 'high-grade', 'significant', 'excellent',
+    'breakthrough', 'achievement', 'record', 'boost', 'progress'
+)
+NEGATIVE_KEYWORDS = (
+    'decrease', 'decline', 'loss', 'suspension', 'delay', 'downgrade', 
+    'closure', 'reduction', 'cut', 'lower', 'disappointing', 'concern',
+    'issue', 'problem', 'halt', 'stop'
+)
+
+# Built-in list of ASX mining companies; extend via mining_companies.json
+DEFAULT_MINING_COMPANIES = (
+    # Major miners
+    {"code": "BHP", "name": "BHP Group Limited", "sector": "Diversified Metals"},
+    {"code": "RIO", "name": "Rio Tinto Limited", "sector": "Diversified Metals"},
+    {"code": "FMG", "name": "Fortescue Metals Group Ltd", "sector": "Iron Ore"},
+    {"code": "NCM", "name": "Newcrest Mining Limited", "sector": "Gold"},
+    {"code": "EVN", "name": "Evolution Mining Limited", "sector": "Gold"},
+    {"code": "NST", "name": "Northern Star Resources Ltd", "sector": "Gold"},
+    {"code": "MIN", "name": "Mineral Resources Limited", "sector": "Diversified Metals"},
+    {"code": "IGO", "name": "IGO Limited", "sector": "Nickel/Lithium"},
+
+    # Gold miners
+    {"code": "SBM", "name": "St Barbara Limited", "sector": "Gold"},
+    {"code": "RSG", "name": "Resolute Mining Limited", "sector": "Gold"},
+    {"code": "RRL", "name": "Regis Resources Limited", "sector": "Gold"},
+    {"code": "SAR", "name": "Saracen Mineral Holdings Limited", "sector": "Gold"},
+    {"code": "GOR", "name": "Gold Road Resources Limited", "sector": "Gold"},
+    {"code": "DCN", "name": "Dacian Gold Limited", "sector": "Gold"},
+    {"code": "KLA", "name": "Kirkland Lake Gold Ltd", "sector": "Gold"},
+    {"code": "LRV", "name": "Larvotto Resources Limited", "sector": "Gold"},
+    {"code": "TMR", "name": "Tempus Resources Ltd", "sector": "Gold"},
+    {"code": "NVA", "name": "Nova Minerals Limited", "sector": "Gold"},
+
+    # Lithium and battery metals
+    {"code": "PLS", "name": "Pilbara Minerals Limited", "sector": "Lithium"},
+    {"code": "ORE", "name": "Orocobre Limited", "sector": "Lithium"},
+    {"code": "GXY", "name": "Galaxy Resources Limited", "sector": "Lithium"},
+    {"code": "CXO", "name": "Core Lithium Ltd", "sector": "Lithium"},
+    {"code": "LPD", "name": "Lepidico Ltd", "sector": "Lithium"},
+    {"code": "ARI", "name": "Argosy Minerals Limited", "sector": "Lithium"},
+    {"code": "ASN", "name": "Anson Resources Limited", "sector": "Lithium"},
+    {"code": "LTR", "name": "Liontown Resources Limited", "sector": "Lithium"},
+
+    # Uranium
+    {"code": "BOE", "name": "Boss Energy Limited", "sector": "Uranium"},
+    {"code": "PEN", "name": "Peninsula Energy Limited", "sector": "Uranium"},
+    {"code": "BMN", "name": "Bannerman Energy Ltd", "sector": "Uranium"},
+    {"code": "DYL", "name": "Deep Yellow Limited", "sector": "Uranium"},
+    {"code": "LOT", "name": "Lotus Resources Limited", "sector": "Uranium"},
+
+    # Copper
+    {"code": "AZS", "name": "Azure Minerals Limited", "sector": "Copper"},
+    {"code": "C6C", "name": "Copper Mountain Mining Corporation", "sector": "Copper"},
+    {"code": "29M", "name": "29Metals Limited", "sector": "Copper"},
+    {"code": "SFR", "name": "Sandfire Resources Limited", "sector": "Copper"},
+
+    # Iron ore
+    {"code": "GRR", "name": "Grange Resources Limited", "sector": "Iron Ore"},
+    {"code": "AGO", "name": "Atlas Iron Limited", "sector": "Iron Ore"},
+    {"code": "BCI", "name": "BC Iron Limited", "sector": "Iron Ore"},
+    {"code": "FRI", "name": "Fortescue Future Industries", "sector": "Iron Ore"},
+
+    # Other metals
+    {"code": "MLS", "name": "Metals X Limited", "sector": "Tin"},
+    {"code": "VMG", "name": "VanMag Limited", "sector": "Vanadium"},
+    {"code": "FYI", "name": "FYI Resources Limited", "sector": "Alumina"},
+    {"code": "SYR", "name": "Syrah Resources Limited", "sector": "Graphite"},
+    {"code": "TNG", "name": "TNG Limited", "sector": "Titanium"},
+
+    # Rare earths
+    {"code": "LYC", "name": "Lynas Rare Earths Ltd", "sector": "Rare Earths"},
+    {"code": "ARU", "name": "Arafura Resources Limited", "sector": "Rare Earths"},
+    {"code": "IXR", "name": "Ionic Rare Earths Limited", "sector": "Rare Earths"},
+
+    # Coal (if relevant)
+    {"code": "WHC", "name": "Whitehaven Coal Limited", "sector": "Coal"},
+    {"code": "NHC", "name": "New Hope Corporation Limited", "sector": "Coal"},
+
+    # Energy/Oil & Gas
+    {"code": "WDS", "name": "Woodside Energy Group Ltd", "sector": "Energy"},
+    {"code": "STO", "name": "Santos Limited", "sector": "Energy"},
+    {"code": "ORG", "name": "Origin Energy Limited", "sector": "Energy"},
+    {"code": "EXR", "name": "Elixir Energy Limited", "sector": "Gas"}
+)
+
+def classify_sentiment(title_lower: str) -> str:
+    """Classify a lower-cased title by counting the sentiment keywords it contains."""
+    positive_score = sum(1 for keyword in POSITIVE_KEYWORDS if keyword in title_lower)
+    if not positive_score:
+        # Any single negative keyword outscores zero; stop at the first one
+        if any(keyword in title_lower for keyword in NEGATIVE_KEYWORDS):
+            return "negative"
+        return "neutral"
+    negative_score = sum(1 for keyword in NEGATIVE_KEYWORDS if keyword in title_lower)
+    
+    if positive_score > negative_score:
+        return "positive"
+    if negative_score > positive_score:
+        return "negative"
+    return "neutral"
+
+@dataclass(slots=True, frozen=True)
 class Announcement:
     company_name: str
     company_code: str
@@ -28,17 +155,34 @@ class Announcement:
     time: str
     url: str
     sentiment: str = "neutral"
-    key_points: List[str] = None
+    key_points: Tuple[str, ...] = ()
+    # Lower-cased title cached from analysis for keyword checks when formatting
+    title_lower: str = field(default='', repr=False, compare=False)
 
 class ASXMiningScanner:
     def __init__(self):
         """Initialize the ASX Mining Scanner for GitHub Actions."""
         self.config = self.load_config_from_env()
         self.mining_companies = self.load_mining_companies()
+        self._company_by_code = {company['code']: company for company in self.mining_companies}
+        # (lower-cased keyword, key point label) pairs for analyze_announcement
+        self._key_point_keywords = [
+            (keyword.lower(), f"Related to {keyword}")
+            for keyword in self.config['scanning']['keywords']
+        ]
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': ACCEPT_ENCODING
         })
+        self._etag_cache = self.load_etag_cache()
+        # ETags seen this run; only persisted once the report has been delivered
+        self._pending_etags = {}
+        # Sources that answered 304 Not Modified during the current scrape
+        self._unchanged_sources = set()
+        self._reports_dir_made = False
+        self._smtp = None
+        atexit.register(self.close_smtp)
         
     def load_config_from_env(self) -> dict:
         """Load configuration from environment variables (GitHub Secrets)."""
@@ -61,80 +205,7 @@ class ASXMiningScanner:
     
     def load_mining_companies(self) -> List[Dict]:
         """Load comprehensive list of ASX mining companies."""
-        companies = [
-            # Major miners
-            {"code": "BHP", "name": "BHP Group Limited", "sector": "Diversified Metals"},
-            {"code": "RIO", "name": "Rio Tinto Limited", "sector": "Diversified Metals"},
-            {"code": "FMG", "name": "Fortescue Metals Group Ltd", "sector": "Iron Ore"},
-            {"code": "NCM", "name": "Newcrest Mining Limited", "sector": "Gold"},
-            {"code": "EVN", "name": "Evolution Mining Limited", "sector": "Gold"},
-            {"code": "NST", "name": "Northern Star Resources Ltd", "sector": "Gold"},
-            {"code": "MIN", "name": "Mineral Resources Limited", "sector": "Diversified Metals"},
-            {"code": "IGO", "name": "IGO Limited", "sector": "Nickel/Lithium"},
-            
-            # Gold miners
-            {"code": "SBM", "name": "St Barbara Limited", "sector": "Gold"},
-            {"code": "RSG", "name": "Resolute Mining Limited", "sector": "Gold"},
-            {"code": "RRL", "name": "Regis Resources Limited", "sector": "Gold"},
-            {"code": "SAR", "name": "Saracen Mineral Holdings Limited", "sector": "Gold"},
-            {"code": "GOR", "name": "Gold Road Resources Limited", "sector": "Gold"},
-            {"code": "DCN", "name": "Dacian Gold Limited", "sector": "Gold"},
-            {"code": "KLA", "name": "Kirkland Lake Gold Ltd", "sector": "Gold"},
-            {"code": "LRV", "name": "Larvotto Resources Limited", "sector": "Gold"},
-            {"code": "TMR", "name": "Tempus Resources Ltd", "sector": "Gold"},
-            {"code": "NVA", "name": "Nova Minerals Limited", "sector": "Gold"},
-            
-            # Lithium and battery metals
-            {"code": "PLS", "name": "Pilbara Minerals Limited", "sector": "Lithium"},
-            {"code": "ORE", "name": "Orocobre Limited", "sector": "Lithium"},
-            {"code": "GXY", "name": "Galaxy Resources Limited", "sector": "Lithium"},
-            {"code": "CXO", "name": "Core Lithium Ltd", "sector": "Lithium"},
-            {"code": "LPD", "name": "Lepidico Ltd", "sector": "Lithium"},
-            {"code": "ARI", "name": "Argosy Minerals Limited", "sector": "Lithium"},
-            {"code": "ASN", "name": "Anson Resources Limited", "sector": "Lithium"},
-            {"code": "LTR", "name": "Liontown Resources Limited", "sector": "Lithium"},
-            
-            # Uranium
-            {"code": "BOE", "name": "Boss Energy Limited", "sector": "Uranium"},
-            {"code": "PEN", "name": "Peninsula Energy Limited", "sector": "Uranium"},
-            {"code": "BMN", "name": "Bannerman Energy Ltd", "sector": "Uranium"},
-            {"code": "DYL", "name": "Deep Yellow Limited", "sector": "Uranium"},
-            {"code": "LOT", "name": "Lotus Resources Limited", "sector": "Uranium"},
-            
-            # Copper
-            {"code": "AZS", "name": "Azure Minerals Limited", "sector": "Copper"},
-            {"code": "C6C", "name": "Copper Mountain Mining Corporation", "sector": "Copper"},
-            {"code": "29M", "name": "29Metals Limited", "sector": "Copper"},
-            {"code": "SFR", "name": "Sandfire Resources Limited", "sector": "Copper"},
-            
-            # Iron ore
-            {"code": "GRR", "name": "Grange Resources Limited", "sector": "Iron Ore"},
-            {"code": "AGO", "name": "Atlas Iron Limited", "sector": "Iron Ore"},
-            {"code": "BCI", "name": "BC Iron Limited", "sector": "Iron Ore"},
-            {"code": "FRI", "name": "Fortescue Future Industries", "sector": "Iron Ore"},
-            
-            # Other metals
-            {"code": "MLS", "name": "Metals X Limited", "sector": "Tin"},
-            {"code": "VMG", "name": "VanMag Limited", "sector": "Vanadium"},
-            {"code": "FYI", "name": "FYI Resources Limited", "sector": "Alumina"},
-            {"code": "SYR", "name": "Syrah Resources Limited", "sector": "Graphite"},
-            {"code": "TNG", "name": "TNG Limited", "sector": "Titanium"},
-            
-            # Rare earths
-            {"code": "LYC", "name": "Lynas Rare Earths Ltd", "sector": "Rare Earths"},
-            {"code": "ARU", "name": "Arafura Resources Limited", "sector": "Rare Earths"},
-            {"code": "IXR", "name": "Ionic Rare Earths Limited", "sector": "Rare Earths"},
-            
-            # Coal (if relevant)
-            {"code": "WHC", "name": "Whitehaven Coal Limited", "sector": "Coal"},
-            {"code": "NHC", "name": "New Hope Corporation Limited", "sector": "Coal"},
-            
-            # Energy/Oil & Gas
-            {"code": "WDS", "name": "Woodside Energy Group Ltd", "sector": "Energy"},
-            {"code": "STO", "name": "Santos Limited", "sector": "Energy"},
-            {"code": "ORG", "name": "Origin Energy Limited", "sector": "Energy"},
-            {"code": "EXR", "name": "Elixir Energy Limited", "sector": "Gas"}
-        ]
+        companies = list(DEFAULT_MINING_COMPANIES)
         
         # Load additional companies from file if exists
         try:
@@ -143,46 +214,97 @@ class ASXMiningScanner:
                     additional_companies = json.load(f)
                     companies.extend(additional_companies)
         except Exception as e:
-            logger.warning(f"Could not load additional companies: {e}")
+            logger.warning("Could not load additional companies: %s", e)
         
         return companies
     
+    def load_etag_cache(self) -> Dict[str, str]:
+        """Load ETags saved by previous runs."""
+        try:
+            if os.path.exists(ETAG_CACHE_FILE):
+                with open(ETAG_CACHE_FILE, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning("Could not load ETag cache: %s", e)
+        return {}
+    
+    def save_etag_cache(self):
+        """Persist ETags so the next run can issue conditional GETs."""
+        try:
+            self._ensure_reports_dir()
+            with open(ETAG_CACHE_FILE, 'w') as f:
+                json.dump(self._etag_cache, f)
+        except Exception as e:
+            logger.warning("Could not save ETag cache: %s", e)
+    
+    def commit_etags(self):
+        """Adopt this run's ETags and persist them for the next run."""
+        if not self._pending_etags:
+            return
+        self._etag_cache.update(self._pending_etags)
+        self._pending_etags = {}
+        self.save_etag_cache()
+    
+    def _ensure_reports_dir(self):
+        """Create the reports directory once per process."""
+        if not self._reports_dir_made:
+            os.makedirs(REPORTS_DIR, exist_ok=True)
+            self._reports_dir_made = True
+    
+    def save_report(self, report: str, filename: str):
+        """Write the report to disk in a single unbuffered write."""
+        self._ensure_reports_dir()
+        data = memoryview(report.encode('utf-8'))
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+    
     def get_asx_announcements(self, date: str = None) -> List[Dict]:
         """Scrape ASX announcements using multiple sources."""
         if not date:
             date = datetime.now().strftime("%Y-%m-%d")
+        self._unchanged_sources = set()
         
-        announcements = []
-        
-        # Method 1: Try Market Index
-        announcements.extend(self.scrape_market_index())
-        
-        # Method 2: Try ASX-specific financial sites
-        announcements.extend(self.scrape_simply_wall_st())
+        scrapers = [
+            self.scrape_market_index,    # Method 1: Try Market Index
+            self.scrape_simply_wall_st,  # Method 2: Try ASX-specific financial sites
+            self.scrape_commsec_style,   # Method 3: Try CommSec or other sources
+        ]
         
-        # Method 3: Try CommSec or other sources
-        announcements.extend(self.scrape_commsec_style())
+        # Fetch all sources concurrently; each scraper handles its own errors.
+        # Scrapers may be generators, so drain them inside the worker thread.
+        with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
+            results = list(executor.map(lambda scrape: list(scrape(date)), scrapers))
         
         # Remove duplicates based on company code and title
         unique_announcements = []
         seen = set()
-        for ann in announcements:
-            key = f"{ann.get('company_code', '')}-{ann.get('title', '')}"
+        for ann in chain.from_iterable(results):
+            key = (ann.get('company_code', ''), ann.get('title', ''))
             if key not in seen:
                 seen.add(key)
                 unique_announcements.append(ann)
         
         return unique_announcements
     
-    def scrape_market_index(self) -> List[Dict]:
-        """Scrape from Market Index website."""
-        announcements = []
+    def scrape_market_index(self, date: str) -> Iterator[Dict]:
+        """Scrape from Market Index website, yielding one row at a time."""
         try:
             url = "https://www.marketindex.com.au/asx/announcements"
-            response = self.session.get(url, timeout=30)
+            headers = {}
+            if url in self._etag_cache:
+                headers['If-None-Match'] = self._etag_cache[url]
+            response = self.session.get(url, headers=headers, timeout=30)
+            if response.status_code == 304:
+                logger.info("Market Index unchanged since last run")
+                self._unchanged_sources.add("Market Index")
+                return
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml', parse_only=_TABLE_STRAINER)
             
             # Look for various table structures
             tables = soup.find_all('table')
@@ -197,30 +319,32 @@ class ASXMiningScanner:
                             title_text = cells[2].get_text(strip=True)
                             
                             # Extract company code
-                            company_match = re.search(r'\b([A-Z]{2,4})\b', company_text)
+                            company_match = _CODE_RE.search(company_text)
                             if company_match:
                                 company_code = company_match.group(1)
                                 if self.is_mining_company(company_code):
-                                    company_name = re.sub(r'\([A-Z]{2,4}\)', '', company_text).strip()
+                                    company_name = _PARENS_CODE_RE.sub('', company_text).strip()
                                     
-                                    announcements.append({
+                                    yield {
                                         'time': time_text,
                                         'company_code': company_code,
                                         'company_name': company_name,
                                         'title': title_text,
-                                        'date': datetime.now().strftime("%Y-%m-%d"),
+                                        'date': date,
                                         'url': url,
                                         'content': title_text
-                                    })
+                                    }
                     except Exception as e:
                         continue
+            
+            # Stage the ETag; run_daily_scan commits it once the report is sent
+            if response.headers.get('ETag'):
+                self._pending_etags[url] = response.headers['ETag']
                         
         except Exception as e:
-            logger.error(f"Error scraping Market Index: {e}")
-        
-        return announcements
+            logger.error("Error scraping Market Index: %s", e)
     
-    def scrape_simply_wall_st(self) -> List[Dict]:
+    def scrape_simply_wall_st(self, date: str) -> Iterable[Dict]:
         """Scrape from Simply Wall St or similar financial sites."""
         announcements = []
         try:
@@ -228,11 +352,11 @@ class ASXMiningScanner:
             # For now, return empty list
             pass
         except Exception as e:
-            logger.error(f"Error scraping Simply Wall St: {e}")
+            logger.error("Error scraping Simply Wall St: %s", e)
         
         return announcements
     
-    def scrape_commsec_style(self) -> List[Dict]:
+    def scrape_commsec_style(self, date: str) -> Iterable[Dict]:
         """Scrape from CommSec-style announcement feeds."""
         announcements = []
         try:
@@ -240,66 +364,46 @@ class ASXMiningScanner:
             # For example, RSS feeds or other financial news sites
             pass
         except Exception as e:
-            logger.error(f"Error scraping CommSec style: {e}")
+            logger.error("Error scraping CommSec style: %s", e)
         
         return announcements
     
     def is_mining_company(self, company_code: str) -> bool:
         """Check if a company code belongs to a mining company."""
-        return any(company['code'] == company_code for company in self.mining_companies)
+        return company_code in self._company_by_code
     
     def get_company_info(self, company_code: str) -> Optional[Dict]:
         """Get company information by code."""
-        for company in self.mining_companies:
-            if company['code'] == company_code:
-                return company
-        return None
+        return self._company_by_code.get(company_code)
     
-    def analyze_announcement(self, announcement: Dict) -> Announcement:
-        """Analyze and categorize an announcement."""
-        title = announcement.get('title', '')
-        content = announcement.get('content', title)
-        
-        # Enhanced sentiment analysis
-        positive_keywords = [
-            'increase', 'growth', 'strong', 'successful', 'positive', 'upgrade', 
-            'expansion', 'discovery', 'high-grade', 'significant', 'excellent',
-            'breakthrough', 'achievement', 'record', 'boost', 'progress'
-        ]
-        negative_keywords = [
-            'decrease', 'decline', 'loss', 'suspension', 'delay', 'downgrade', 
-            'closure', 'reduction', 'cut', 'lower', 'disappointing', 'concern',
-            'issue', 'problem', 'halt', 'stop'
-        ]
-        
-        sentiment = "neutral"
-        title_lower = title.lower()
-        
-        positive_score = sum(1 for keyword in positive_keywords if keyword in title_lower)
-        negative_score = sum(1 for keyword in negative_keywords if keyword in title_lower)
-        
-        if positive_score > negative_score:
-            sentiment = "positive"
-        elif negative_score > positive_score:
-            sentiment = "negative"
-        
-        # Extract key points
-        key_points = []
-        for keyword in self.config['scanning']['keywords']:
-            if keyword.lower() in title_lower:
-                key_points.append(f"Related to {keyword}")
-        
-        return Announcement(
-            company_name=announcement.get('company_name', ''),
-            company_code=announcement.get('company_code', ''),
-            title=title,
-            content=content,
-            date=announcement.get('date', ''),
-            time=announcement.get('time', ''),
-            url=announcement.get('url', ''),
-            sentiment=sentiment,
-            key_points=key_points
-        )
+    def analyze_announcement(self, announcement: Dict) -> Optional[Announcement]:
+        """Analyze and categorize an announcement, returning None if it can't be parsed."""
+        try:
+            title = announcement.get('title', '')
+            content = announcement.get('content', title)
+            
+            # Enhanced sentiment analysis
+            title_lower = title.lower()
+            sentiment = classify_sentiment(title_lower)
+            
+            # Extract key points
+            key_points = tuple(label for keyword, label in self._key_point_keywords if keyword in title_lower)
+            
+            return Announcement(
+                company_name=announcement.get('company_name', ''),
+                company_code=announcement.get('company_code', ''),
+                title=title,
+                content=content,
+                date=announcement.get('date', ''),
+                time=announcement.get('time', ''),
+                url=announcement.get('url', ''),
+                sentiment=sentiment,
+                key_points=key_points,
+                title_lower=title_lower
+            )
+        except Exception as e:
+            logger.error("Error analyzing announcement: %s", e)
+            return None
     
     def format_announcement_summary(self, announcement: Announcement) -> str:
         """Format announcement in the requested style."""
@@ -307,53 +411,56 @@ class ASXMiningScanner:
         
         # Enhanced formatting to match your examples more closely
         title = announcement.title
+        title_lower = announcement.title_lower or title.lower()
         
         # Look for project/location names in titles
-        project_match = re.search(r'\b(at|from|in)\s+([A-Z][a-zA-Z\s]+?)(?:\s|$|,|\()', title)
-        location_match = re.search(r'\b([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*)\s+(?:Project|Mine|Deposit|Operation)', title)
+        project_match = _PROJECT_RE.search(title)
+        location_match = _LOCATION_RE.search(title)
         
-        summary = f"• **{announcement.company_name}** "
+        parts = [f"• **{announcement.company_name}** "]
         
         # Add contextual information based on title content
-        if 'production' in title.lower():
-            summary += "reported production "
-        elif 'drilling' in title.lower():
-            summary += "announced drilling "
-        elif 'resource' in title.lower():
-            summary += "updated resource "
-        elif 'approval' in title.lower():
-            summary += "received approval "
-        elif 'acquisition' in title.lower():
-            summary += "announced acquisition "
+        if 'production' in title_lower:
+            parts.append("reported production ")
+        elif 'drilling' in title_lower:
+            parts.append("announced drilling ")
+        elif 'resource' in title_lower:
+            parts.append("updated resource ")
+        elif 'approval' in title_lower:
+            parts.append("received approval ")
+        elif 'acquisition' in title_lower:
+            parts.append("announced acquisition ")
         else:
-            summary += "announced "
+            parts.append("announced ")
         
         # Add project/location if found
         if project_match:
             project_name = project_match.group(2).strip()
-            summary += f"at **{project_name}** "
+            parts.append(f"at **{project_name}** ")
         elif location_match:
             location_name = location_match.group(1).strip()
-            summary += f"for **{location_name}** "
+            parts.append(f"for **{location_name}** ")
         
         # Add key metrics or numbers if found
-        numbers = re.findall(r'(\d+(?:\.\d+)?(?:Mlb|klb|Mt|kt|oz|%|million|billion))', title)
-        if numbers:
-            summary += f"with {numbers[0]} "
+        number_match = _NUMBERS_RE.search(title)
+        if number_match:
+            parts.append(f"with {number_match.group(1)} ")
         
         # Add main content
-        summary += f"- {title}"
+        parts.append(f"- {title}")
         
         # Add company code
-        summary += f" ({announcement.company_code})"
+        parts.append(f" ({announcement.company_code})")
         
-        return summary
+        return "".join(parts)
     
-    def generate_daily_report(self, announcements: List[Announcement]) -> str:
+    def generate_daily_report(self, announcements: List[Announcement], run_ts: Optional[datetime] = None) -> str:
         """Generate the daily email report."""
+        if run_ts is None:
+            run_ts = datetime.now()
         if not announcements:
             return f"""
-# ASX Mining Daily Report - {datetime.now().strftime('%B %d, %Y')}
+# ASX Mining Daily Report - {run_ts.strftime('%B %d, %Y')}
 
 ## Summary
 No significant mining announcements found for today.
@@ -361,89 +468,117 @@ No significant mining announcements found for today.
 The scanner checked {len(self.mining_companies)} mining companies but found no new announcements meeting the criteria.
 
 ---
-*Report generated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC*
+*Report generated at {run_ts.strftime('%Y-%m-%d %H:%M:%S')} UTC*
 *Monitoring {len(self.mining_companies)} ASX mining companies*
 """
         
-        # Group by sentiment
-        positive_announcements = [a for a in announcements if a.sentiment == "positive"]
-        neutral_announcements = [a for a in announcements if a.sentiment == "neutral"]
-        negative_announcements = [a for a in announcements if a.sentiment == "negative"]
-        
-        report = f"""
-# ASX Mining Daily Report - {datetime.now().strftime('%B %d, %Y')}
+        # Group by sentiment, company and sector in a single pass
+        by_sentiment = defaultdict(list)
+        companies = defaultdict(list)
+        sectors = Counter()
+        for announcement in announcements:
+            by_sentiment[announcement.sentiment].append(announcement)
+            companies[announcement.company_code].append(announcement)
+            company_info = self._company_by_code.get(announcement.company_code)
+            sectors[company_info['sector'] if company_info else "Other"] += 1
+        positive_announcements = by_sentiment["positive"]
+        neutral_announcements = by_sentiment["neutral"]
+        negative_announcements = by_sentiment["negative"]
+        
+        parts = [f"""
+# ASX Mining Daily Report - {run_ts.strftime('%B %d, %Y')}
 
 ## Summary
 Found {len(announcements)} significant announcements from mining companies today.
 
 ## Key Announcements
 
-"""
+"""]
         
         # Add positive news first
         if positive_announcements:
-            report += "### 📈 Positive Developments\n"
+            parts.append("### 📈 Positive Developments\n")
             for announcement in positive_announcements:
-                report += self.format_announcement_summary(announcement) + "\n"
-            report += "\n"
+                parts.append(self.format_announcement_summary(announcement) + "\n")
+            parts.append("\n")
         
         # Add neutral news
         if neutral_announcements:
-            report += "### 📊 General Updates\n"
+            parts.append("### 📊 General Updates\n")
             for announcement in neutral_announcements:
-                report += self.format_announcement_summary(announcement) + "\n"
-            report += "\n"
+                parts.append(self.format_announcement_summary(announcement) + "\n")
+            parts.append("\n")
         
         # Add negative news
         if negative_announcements:
-            report += "### 📉 Challenges/Concerns\n"
+            parts.append("### 📉 Challenges/Concerns\n")
             for announcement in negative_announcements:
-                report += self.format_announcement_summary(announcement) + "\n"
-            report += "\n"
+                parts.append(self.format_announcement_summary(announcement) + "\n")
+            parts.append("\n")
         
         # Company breakdown
-        companies = {}
-        for announcement in announcements:
-            if announcement.company_code not in companies:
-                companies[announcement.company_code] = []
-            companies[announcement.company_code].append(announcement)
-        
-        report += "## Company Breakdown\n"
+        parts.append("## Company Breakdown\n")
         for company_code, company_announcements in sorted(companies.items()):
-            company_info = self.get_company_info(company_code)
+            company_info = self._company_by_code.get(company_code)
             company_name = company_info['name'] if company_info else company_announcements[0].company_name
             sector = company_info['sector'] if company_info else "Mining"
-            report += f"**{company_name} ({company_code})** - {sector}: {len(company_announcements)} announcement(s)\n"
+            parts.append(f"**{company_name} ({company_code})** - {sector}: {len(company_announcements)} announcement(s)\n")
         
-        report += f"""
+        parts.append(f"""
 
 ## Sector Summary
-"""
+""")
         
         # Sector breakdown
-        sectors = {}
-        for announcement in announcements:
-            company_info = self.get_company_info(announcement.company_code)
-            sector = company_info['sector'] if company_info else "Other"
-            if sector not in sectors:
-                sectors[sector] = 0
-            sectors[sector] += 1
-        
-        for sector, count in sorted(sectors.items(), key=lambda x: x[1], reverse=True):
-            report += f"- {sector}: {count} announcement(s)\n"
+        for sector, count in sectors.most_common():
+            parts.append(f"- {sector}: {count} announcement(s)\n")
         
-        report += f"""
+        parts.append(f"""
 
 ---
-*Report generated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC*
+*Report generated at {run_ts.strftime('%Y-%m-%d %H:%M:%S')} UTC*
 *Monitoring {len(self.mining_companies)} ASX mining companies*
 *Next report: Tomorrow at 8:00 AM AEST*
-"""
+""")
         
-        return report
+        return "".join(parts)
     
-    def send_email_report(self, report: str):
-        """Send the daily report via email."""
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Return an authenticated SMTP connection, reconnecting if needed."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close_smtp()
+        
+        email_config = self.config['email']
+        if email_config['smtp_port'] == 465:
+            # Implicit TLS, no STARTTLS round-trip
+            server = smtplib.SMTP_SSL(email_config['smtp_server'], email_config['smtp_port'])
+        else:
+            server = smtplib.SMTP(email_config['smtp_server'], email_config['smtp_port'])
+            server.starttls()
+        server.login(email_config['sender_email'], email_config['sender_password'])
+        self._smtp = server
+        return server
+    
+    def close_smtp(self):
+        """Close the cached SMTP connection, if any."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        finally:
+            self._smtp = None
+    
+    def send_email_report(self, report: str, run_ts: Optional[datetime] = None) -> bool:
+        """Send the daily report via email, returning whether it was sent."""
+        if run_ts is None:
+            run_ts = datetime.now()
         try:
             if not all([
                 self.config['email']['sender_email'],
@@ -451,76 +586,74 @@ Found {len(announcements)} significant announcements from mining companies today
                 self.config['email']['recipient_email']
             ]):
                 logger.error("Email configuration incomplete")
-                return
+                return False
             
-            msg = MimeMultipart()
+            msg = EmailMessage()
             msg['From'] = self.config['email']['sender_email']
             msg['To'] = self.config['email']['recipient_email']
-            msg['Subject'] = f"ASX Mining Daily Report - {datetime.now().strftime('%Y-%m-%d')}"
+            msg['Subject'] = f"ASX Mining Daily Report - {run_ts.strftime('%Y-%m-%d')}"
             
-            msg.attach(MimeText(report, 'plain'))
+            msg.set_content(report, cte='quoted-printable')
             
-            server = smtplib.SMTP(self.config['email']['smtp_server'], self.config['email']['smtp_port'])
-            server.starttls()
-            server.login(self.config['email']['sender_email'], self.config['email']['sender_password'])
-            text = msg.as_string()
-            server.sendmail(
-                self.config['email']['sender_email'], 
-                self.config['email']['recipient_email'], 
-                text
-            )
-            server.quit()
+            server = self._get_smtp()
+            server.send_message(msg)
             
-            logger.info(f"Email report sent successfully to {self.config['email']['recipient_email']}")
+            logger.info("Email report sent successfully to %s", self.config['email']['recipient_email'])
+            return True
             
         except Exception as e:
-            logger.error(f"Error sending email: {e}")
+            logger.error("Error sending email: %s", e)
             raise
     
     def run_daily_scan(self):
         """Run the daily scanning process."""
         logger.info("Starting daily ASX mining scan...")
+        run_ts = datetime.now()
         
         try:
             # Get announcements
-            raw_announcements = self.get_asx_announcements()
-            logger.info(f"Found {len(raw_announcements)} raw announcements")
+            raw_announcements = self.get_asx_announcements(run_ts.strftime("%Y-%m-%d"))
+            logger.info("Found %d raw announcements", len(raw_announcements))
+            
+            # A 304 yields no rows; don't mistake that for a day without news
+            if not raw_announcements and self._unchanged_sources:
+                logger.info(
+                    "Source unchanged since last run (%s); keeping existing report and skipping email",
+                    ", ".join(sorted(self._unchanged_sources))
+                )
+                return
             
-            # Filter and analyze announcements
-            analyzed_announcements = []
-            for raw_announcement in raw_announcements:
-                try:
-                    analyzed = self.analyze_announcement(raw_announcement)
-                    if len(analyzed.title) >= self.config['scanning']['min_announcement_length']:
-                        analyzed_announcements.append(analyzed)
-                except Exception as e:
-                    logger.error(f"Error analyzing announcement: {e}")
-                    continue
+            # Filter out short titles before paying for analysis
+            min_length = self.config['scanning']['min_announcement_length']
+            candidates = (raw for raw in raw_announcements if len(raw.get('title', '')) >= min_length)
+            analyzed_announcements = [
+                analyzed for analyzed in map(self.analyze_announcement, candidates)
+                if analyzed is not None
+            ]
             
-            logger.info(f"Processed {len(analyzed_announcements)} significant announcements")
+            logger.info("Processed %d significant announcements", len(analyzed_announcements))
             
             # Generate report
-            report = self.generate_daily_report(analyzed_announcements)
+            report = self.generate_daily_report(analyzed_announcements, run_ts)
             
             # Save report to file
-            report_filename = f"reports/mining_report_{datetime.now().strftime('%Y%m%d')}.md"
-            os.makedirs("reports", exist_ok=True)
-            with open(report_filename, 'w', encoding='utf-8') as f:
-                f.write(report)
-            logger.info(f"Report saved to {report_filename}")
+            report_filename = os.path.join(REPORTS_DIR, f"mining_report_{run_ts.strftime('%Y%m%d')}.md")
+            self.save_report(report, report_filename)
+            logger.info("Report saved to %s", report_filename)
             
             # Print report to GitHub Actions log
             print("=" * 80)
             print(report)
             print("=" * 80)
             
-            # Send email
-            self.send_email_report(report)
+            # Send email; pages only count as seen once their report has gone out
+            if self.send_email_report(report, run_ts):
+                self.commit_etags()
             
             logger.info("Daily scan completed successfully")
             
         except Exception as e:
-            logger.error(f"Error in daily scan: {e}")
+            logger.error("Error in daily scan: %s", e)
             # Send error notification
             error_report = f"""
 # ASX Mining Scanner - Error Report
@@ -532,7 +665,7 @@ Please check the GitHub Actions logs for more details.
 Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC
 """
             try:
-                self.send_email_report(error_report)
+                self.send_email_report(error_report, run_ts)
             except:
                 logger.error("Could not send error notification email")
             raise